@@ -2,12 +2,40 @@
 import sys
 import re
 import os
+import functools
+import selectors
 import subprocess
-import argparse
-import xml.etree.ElementTree as ET
+from types import SimpleNamespace
 from pathlib import Path, PureWindowsPath
 from signal import signal, SIGINT
 
+# Compiled once at import; these run against every line of build output.
+# Groups: 1=full path, 2=line, 3=col, 4=message.
+_PATH_LINE_COL_RE = re.compile(r'([A-Za-z]:\\[^:(]+)(?:\((\d+),(\d+)\))?:\s*(.*)')
+# Single alternation so format_message scans each message once; the 'err'
+# branch is case-insensitive, the path branch keeps its uppercase drive.
+_FORMAT_RE = re.compile(r'(?P<err>(?i:\berror\b))|(?P<path>[A-Z]:\\[^\s\):]+)')
+
+_CONTROL_CODES = {
+    'endc': '\033[m',
+    'red': '\033[31m',
+    'boldred': '\033[1;31m',
+    'green': '\033[32m',
+    'yellow': '\033[33m',
+    'blue': '\033[34m',
+    'cyan': '\033[36m'
+}
+
+# Replacement strings used on every formatted line, built once.
+_ENDC = _CONTROL_CODES['endc']
+_GREEN = _CONTROL_CODES['green']
+_BUILD_SUCCEEDED = f"{_GREEN}Build succeeded.{_ENDC}"
+_WARNINGS = f"{_CONTROL_CODES['yellow']}Warning(s){_ENDC}"
+_ERRORS = f"{_CONTROL_CODES['boldred']}Error(s){_ENDC}"
+_ERROR_REPL = f"{_CONTROL_CODES['boldred']}error{_ENDC}"
+
+_BS_TO_FS = str.maketrans('\\', '/')
+
 def sigint(
     _signum,
     _stackframe,
@@ -46,7 +74,7 @@ def main():
         return 0
 
     CC = None
-    CFLAGS = ""
+    CFLAGS = []
 
     cc_hint = ""
 
@@ -57,170 +85,239 @@ def main():
     if framework_ver == 'net6.0' or framework_ver == 'net8.0' and not uses_com:
         cc_hint = "Ensure environment variable DOTNET is set in WSL."
         CC = os.getenv('DOTNET')
-        CFLAGS =  str.join(
-            ' ',
-            [
-                "build",
-                f"'{project_file.name}'",
-                f"--verbosity \"{args.verbosity}\"",
-                f"--configuration \"{args.config}\"",
-                f"--framework \"{framework_ver}\"",
-                nowarn,
-                f"/p:Platform=\"{args.platform}\"",
-                f"/p:WarningLevel=\"{args.warn}\"",
-                f"/p:VSToolsPath='{vstools}'" if vstools != None else "",
-                f"/p:OutputPath='{output}'"
-            ]
-        )
+        CFLAGS = [
+            "build",
+            project_file.name,
+            "--verbosity", args.verbosity,
+            "--configuration", args.config,
+            "--framework", framework_ver,
+            nowarn,
+            f"/p:Platform={args.platform}",
+            f"/p:WarningLevel={args.warn}",
+            f"/p:VSToolsPath={vstools}" if vstools != None else "",
+            f"/p:OutputPath={output}"
+        ]
     else:
         cc_hint = "Ensure environment variable MSBUILD is set in WSL."
         CC = os.getenv('MSBUILD')
-        CFLAGS = str.join(
-            ' ',
-            [
-                nowarn,
-                f"'{project_file.name}'",
-                f"/verbosity:\"{args.verbosity}\"",
-                f"/p:Configuration=\"{args.config}\"",
-                f"/p:Platform=\"{args.platform}\"",
-                f"/p:WarningLevel=\"{args.warn}\"",
-                f"/p:VSToolsPath='{vstools}'" if vstools != None else "",
-                f"/p:OutputPath='{output}'",
-                "2>&1",
-                "|",
-                "tee"
-            ]
-        )
+        CFLAGS = [
+            nowarn,
+            project_file.name,
+            f"/verbosity:{args.verbosity}",
+            f"/p:Configuration={args.config}",
+            f"/p:Platform={args.platform}",
+            f"/p:WarningLevel={args.warn}",
+            f"/p:VSToolsPath={vstools}" if vstools != None else "",
+            f"/p:OutputPath={output}"
+        ]
 
     if CC is None:
         sys.stderr.write(f"No compiler command.\n{cc_hint}.\n")
         return 1
 
-    msg = f"Compiling for framework {C('green')}{framework_ver}{C('endc')}" + \
-        f" with project file {C('green')}{project_file}{C('endc')}..."
+    msg = f"Compiling for framework {_GREEN}{framework_ver}{_ENDC}" + \
+        f" with project file {_GREEN}{project_file}{_ENDC}..."
 
     print(msg)
 
-    cmd = f"'{CC}' {CFLAGS}"
+    cmd = [CC] + [arg for arg in CFLAGS if arg]
 
-    print(cmd)
+    print(str.join(' ', cmd))
 
     p = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        shell=True,
-        encoding='utf-8',
-        errors='replace')
+        shell=False,
+        bufsize=0)
 
     process_output(p)
 
     return 0
 
-def process_output(p: subprocess.Popen):
-    while True:
-        output = p.stdout.readline()
+def iter_lines(p: subprocess.Popen, bufsize: int = 65536):
+    # The one tuned read loop shared by the build and run paths: pull
+    # chunks straight off the pipe fd and yield raw lines. Consumers
+    # write to stdout, so flush once per chunk to keep output live.
+    fd = p.stdout.fileno()
+    buf = b''
+    with selectors.DefaultSelector() as sel:
+        sel.register(p.stdout, selectors.EVENT_READ)
+        while True:
+            sel.select()
+            chunk = os.read(fd, bufsize)
 
-        if output == '' and p.poll() is not None:
-            break
+            if not chunk:
+                break
 
-        sys.stdout.flush()
-        line = output.rstrip()
-
-        pattern = r'''
-          (?P<full_path>                      # start capturing the path
-              [A-Za-z]:\\                     #   drive letter + “:\”
-              [^:(]+                          #   one or more chars that are NOT “:” or “(”
-          )
-          (?:\((?P<line>\d+),(?P<col>\d+)\))? # optional “(line,col)”
-          :\s*                                # then a “:” and any spaces
-          (?P<message>.*)                     # finally, the rest of the error message
-        '''
-        m = re.search(pattern, line, re.VERBOSE)
-
-        if m and len(m.groups()) == 4:
-            full_path =  m.group('full_path')
-            line_num = m.group('line')
-            col_num = m.group('col')
-            msg = format_message(m.group('message'))
-
-            wsl_path = windows_to_wsl(PureWindowsPath(full_path)).resolve()
-
-            if line_num and col_num:
-                wsl_parsed = f"{wsl_path}:{line_num}:{col_num}"
-            elif line_num:
-                wsl_parsed = f"{wsl_path}:{line_num}"
-            else:
-                wsl_parsed = wsl_path
+            buf += chunk
+            *raw_lines, buf = buf.split(b'\n')
+            yield from raw_lines
+            sys.stdout.buffer.flush()
 
-            print(f"{wsl_parsed}: {msg}")
-            continue
+    if buf:
+        yield buf
 
-        print(format_message(output), end='')
+    p.wait()
 
-def format_message(msg: str) -> str:
-    if "Build succeeded." in msg:
-        msg = msg.replace("Build succeeded.", f"{C('green')}Build succeeded.{C('endc')}")
-    if "Warning(s)" in msg:
-        msg = msg.replace("Warning(s)", f"{C('yellow')}Warning(s){C('endc')}")
-    if "Error(s)" in msg:
-        msg = msg.replace("Error(s)", f"{C('boldred')}Error(s){C('endc')}")
+def process_output(p: subprocess.Popen):
+    # Drain the text layer before writing bytes beneath it, so the
+    # startup banner cannot be reordered after build output.
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+
+    for raw in iter_lines(p):
+        process_line(raw, out)
+
+    out.flush()
+
+def process_line(raw: bytes, out):
+    raw = raw.rstrip()
+
+    # Indented status lines make up most of the log on minimal/quiet
+    # builds. If one mentions no path, error, warning, or build result,
+    # nothing downstream would touch it — forward the bytes as-is.
+    if raw[:1] in (b' ', b'\t') and b':\\' not in raw \
+            and b'rror' not in raw and b'RROR' not in raw \
+            and b'Warning' not in raw and b'Build' not in raw:
+        out.write(raw)
+        out.write(b'\n')
+        return
+
+    line = raw.decode('utf-8', 'replace')
+
+    # Most output lines carry no windows path at all; locate ':\' with a
+    # C-level byte search and confirm a drive letter sits in front of it
+    # before paying for the regex engine at all.
+    i = raw.find(b':\\')
+    m = _PATH_LINE_COL_RE.search(line) if i > 0 and raw[i - 1:i].isalpha() else None
+
+    if m:
+        full_path =  m.group(1)
+        line_num = m.group(2)
+        col_num = m.group(3)
+        msg = format_message(m.group(4))
+
+        wsl_path = windows_to_wsl(full_path)
+
+        if line_num and col_num:
+            wsl_parsed = f"{wsl_path}:{line_num}:{col_num}"
+        elif line_num:
+            wsl_parsed = f"{wsl_path}:{line_num}"
+        else:
+            wsl_parsed = wsl_path
+
+        out.write(f"{wsl_parsed}: {msg}\n".encode('utf-8', 'replace'))
+        return
+
+    formatted = format_message(line)
+
+    if formatted is line:
+        # Untouched line: forward the original bytes, no re-encode.
+        out.write(raw)
+    else:
+        out.write(formatted.encode('utf-8', 'replace'))
+    out.write(b'\n')
 
-    formatted_msg = re.sub(r'\berror\b', f"{C('boldred')}error{C('endc')}", msg, flags=re.IGNORECASE)
-    windows_path_pattern = re.compile(r'([A-Z]:\\[^\s\):]+)')
+def format_message(msg: str) -> str:
+    if "Build" in msg or "Warning" in msg or "Error" in msg:
+        msg = msg.replace("Build succeeded.", _BUILD_SUCCEEDED)
+        msg = msg.replace("Warning(s)", _WARNINGS)
+        msg = msg.replace("Error(s)", _ERRORS)
 
-    def replace_with_wsl(match) -> str:
-        win_path = match.group(1)
-        return str(windows_to_wsl(PureWindowsPath(win_path)).resolve())
+    return _FORMAT_RE.sub(_format_repl, msg)
 
-    formatted_msg = windows_path_pattern.sub(replace_with_wsl, formatted_msg)
-    return formatted_msg
+def _format_repl(match) -> str:
+    if match.lastgroup == 'err':
+        return _ERROR_REPL
+    return windows_to_wsl(match.group('path'))
 
 
 def find_project_file() -> Path:
-    for p in list(Path('.').glob('*')):
-        if p.suffix == '.csproj' or p.suffix == '.vbproj':
-            return p
+    with os.scandir('.') as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith('.csproj') or name.endswith('.vbproj'):
+                return Path(name)
     return None
 
 def get_framework_version(project_file: Path) -> str:
-    tree = ET.parse(project_file.resolve())
-    root = tree.getroot()
-
-    ns = {'msbuild': 'http://schemas.microsoft.com/developer/msbuild/2003'}
+    import xml.etree.ElementTree as ET
+
+    # Stream the csproj and stop at the first framework element instead of
+    # building the whole tree; it lives in the opening PropertyGroup, well
+    # before the (potentially long) item lists.
+    for _, elem in ET.iterparse(project_file, events=('end',)):
+        tag = elem.tag.rpartition('}')[2]
+        if tag in ('TargetFrameworkVersion', 'TargetFramework') and elem.text:
+            return elem.text.strip()
+        elem.clear()
+    return None
 
-    candidates = [
-        ('.//msbuild:TargetFrameworkVersion', ns),
-        ('.//TargetFrameworkVersion', {}),
-        ('.//TargetFramework', {})
-    ]
+_USAGE = """\
+usage: build.py [-h] [--verbosity VERBOSITY] [--config CONFIG]
+                [--platform PLATFORM] [--warn WARN] [-r] [--run-args ...]
+
+WSL Proxy Build
+"""
+
+def get_args() -> SimpleNamespace:
+    # Hand-rolled parser for the six known flags; argparse costs ~15 ms
+    # of setup per invocation, which matters for an edit-build loop.
+    args = SimpleNamespace(
+        verbosity="minimal",
+        config="Debug",
+        platform="AnyCPU",
+        warn="2",
+        run=False,
+        run_args=None)
+
+    valued = {
+        "--verbosity": "verbosity",
+        "--config": "config",
+        "--platform": "platform",
+        "--warn": "warn"
+    }
 
-    for xpath, namespace in candidates:
-        node = root.find(xpath, namespace)
-        if node is not None and node.text:
-            return node.text.strip()
-    return None
+    argv = sys.argv[1:]
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("-h", "--help"):
+            print(_USAGE, end='')
+            sys.exit(0)
+        elif arg in ("-r", "--run"):
+            args.run = True
+        elif arg == "--run-args":
+            args.run_args = argv[i + 1:]
+            break
+        elif arg in valued:
+            i += 1
+            if i == len(argv):
+                sys.stderr.write(f"{_USAGE}argument {arg}: expected a value\n")
+                sys.exit(2)
+            setattr(args, valued[arg], argv[i])
+        else:
+            name, eq, value = arg.partition('=')
+            if eq and name in valued:
+                setattr(args, valued[name], value)
+            else:
+                sys.stderr.write(f"{_USAGE}unrecognized argument: {arg}\n")
+                sys.exit(2)
+        i += 1
 
-def get_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="WSL Proxy Build")
-    parser.add_argument("--verbosity", default="minimal", help="Verbosity level for the build")
-    parser.add_argument("--config", default="Debug", help="Build configuration")
-    parser.add_argument("--platform", default="AnyCPU", help="Target platform")
-    parser.add_argument("--warn", default="2", help="Warning level")
-    parser.add_argument("-r", "--run", action="store_true", help="Run")
-    parser.add_argument("--run-args", nargs=argparse.REMAINDER, help="Run arguments")
-    return parser.parse_args()
+    return args
 
 def get_warnignore(project_file: Path) -> list:
     warnignore_file = project_file.parent / ".warnignore"
-    warnings = []
-    if warnignore_file.exists():
-        with warnignore_file.open() as f:
-            for line in f:
-                stripped = line.strip()
-                if stripped and not stripped.startswith("#"):
-                    warnings.append(stripped)
-    return warnings
+    if not warnignore_file.exists():
+        return []
+    data = warnignore_file.read_text()
+    return [
+        stripped
+        for stripped in (line.strip() for line in data.splitlines())
+        if stripped and not stripped.startswith("#")
+    ]
 
 def get_build_output(project_file: Path, default_output: str = r"bin\Debug") -> PureWindowsPath:
     buildoutput_file = project_file.parent / ".buildoutput"
@@ -245,11 +342,11 @@ def get_run_args(project_file: Path) -> list:
 
     return run_args
 
-def windows_to_wsl(win_path: PureWindowsPath) -> Path:
-    drive = win_path.drive.rstrip(':').lower()
-    remainder = win_path.relative_to(win_path.anchor)
-    posix_remainder = remainder.as_posix()
-    return Path(f"/mnt/{drive}/{posix_remainder}")
+@functools.lru_cache(maxsize=2048)
+def windows_to_wsl(win_path: str) -> str:
+    # 'C:\foo\bar' -> '/mnt/c/foo/bar'. Pure string work: no Path objects
+    # and no resolve(), which would stat every component through /mnt.
+    return '/mnt/' + win_path[0].lower() + win_path[2:].translate(_BS_TO_FS)
 
 def run_executable(exe_path: str, args: [str]):
     if not exe_path:
@@ -263,14 +360,14 @@ def run_executable(exe_path: str, args: [str]):
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             shell=False,
-            encoding='utf-8',
-            errors='replace'
+            bufsize=0
         )
-        while True:
-            output = p.stdout.readline()
-            if output == '' and p.poll() is not None:
-                break
-            print(output, end='')
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+        for raw in iter_lines(p):
+            out.write(raw)
+            out.write(b'\n')
+        out.flush()
 
     except subprocess.CalledProcessError as e:
         print(f"Execution failed with return code {e.returncode}")
@@ -287,19 +384,11 @@ def find_executable(search_path: Path, project: Path) -> Path:
         return None
 
 def C(k: str) -> str:
-
-    control_codes = {
-        'endc': '\033[m',
-        'red': '\033[31m',
-        'boldred': '\033[1;31m',
-        'green': '\033[32m',
-        'yellow': '\033[33m',
-        'blue': '\033[34m',
-        'cyan': '\033[36m'
-    }
-    return control_codes[k]
+    return _CONTROL_CODES[k]
 
 def project_uses_com(project_file: Path) -> bool:
+    import xml.etree.ElementTree as ET
+
     tree = ET.parse(project_file.resolve())
     root = tree.getroot()
 